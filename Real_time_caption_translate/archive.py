@@ -0,0 +1,264 @@
+# archive.py
+import json
+import logging
+import mmap
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+# Fixed-size little-endian index records, read in place from memory-mapped files
+CHUNK_DTYPE = np.dtype([("start", "<u8"), ("offset", "<u8"), ("length", "<u4"), ("samples", "<u4")])
+UTTERANCE_DTYPE = np.dtype([("start", "<u8"), ("end", "<u8"), ("text_offset", "<u8"), ("text_length", "<u4"),
+                            ("sentence", "<u4")])
+
+META_FILE = "session.json"
+AUDIO_FILE = "audio.pcmz"  # Concatenated zlib-compressed chunks of mono 16-bit PCM
+CHUNK_INDEX_FILE = "audio.idx"
+TRANSCRIPT_INDEX_FILE = "transcript.idx"  # One record per tc_sentences entry
+TRANSLATION_INDEX_FILE = "translation.idx"  # One record per tl_sentences entry
+TEXT_FILE = "text.bin"  # UTF-8 sentence texts referenced by the indexes
+
+
+class SessionRecorder:
+    """
+    Write a session archive: compressed chunked audio plus binary utterance indexes.
+    write_audio() is called from the transcription thread, add_translation() from the
+    translation thread; all file access is serialized by a lock, and every method
+    becomes a no-op after close() so late calls from a worker thread are harmless.
+    Data is flushed before each index record, so a crash loses at most the audio
+    still buffered and the index never points past the data written to disk.
+    """
+    CHUNK_SECONDS = 5  # Audio per compressed chunk
+    COMPRESSION_LEVEL = 1  # Fast zlib level, speech PCM gains little from higher levels
+
+    def __init__(self, session_dir: Path, rate: int):
+        self.session_dir = Path(session_dir)
+        self.session_dir.mkdir(parents=True, exist_ok=True)
+        self.rate = rate
+        self.chunk_bytes = rate * 2 * self.CHUNK_SECONDS
+
+        self._lock = threading.Lock()
+        self._closed = False
+        self._buffer = bytearray()
+        self._buffer_start = 0  # Sample offset of the first buffered sample
+        self._total_samples = 0
+        self._last_end = 0  # End sample of the previous utterance
+        self._audio_offset = 0
+        self._text_offset = 0
+
+        self._audio = open(self.session_dir / AUDIO_FILE, 'wb')
+        self._chunks = open(self.session_dir / CHUNK_INDEX_FILE, 'wb')
+        self._transcripts = open(self.session_dir / TRANSCRIPT_INDEX_FILE, 'wb')
+        self._translations = open(self.session_dir / TRANSLATION_INDEX_FILE, 'wb')
+        self._text = open(self.session_dir / TEXT_FILE, 'wb')
+
+        meta = {
+            "version": 1,
+            "rate": rate,
+            "sample_width": 2,
+            "channels": 1,
+            "chunk_seconds": self.CHUNK_SECONDS,
+            "created": time.strftime("%Y-%m-%d %H:%M:%S")
+        }
+        with open(self.session_dir / META_FILE, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=4)
+        logging.info(f"Recording  session to {self.session_dir}")
+
+    @property
+    def total_samples(self) -> int:
+        return self._total_samples
+
+    def write_audio(self, data: bytes):
+        """Append mono 16-bit PCM as produced by convert_to_mono"""
+        with self._lock:
+            if self._closed:
+                return
+            self._buffer += data
+            self._total_samples += len(data) // 2
+            while len(self._buffer) >= self.chunk_bytes:
+                self._flush_chunk(self.chunk_bytes)
+
+    def _flush_chunk(self, size: int):
+        """Compress and write the first size bytes of the buffer as one chunk"""
+        raw = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        compressed = zlib.compress(raw, self.COMPRESSION_LEVEL)
+        self._audio.write(compressed)
+        self._audio.flush()
+        record = np.array([(self._buffer_start, self._audio_offset, len(compressed), len(raw) // 2)],
+                          dtype=CHUNK_DTYPE)
+        self._chunks.write(record.tobytes())
+        self._chunks.flush()
+        self._audio_offset += len(compressed)
+        self._buffer_start += len(raw) // 2
+
+    def _write_text(self, text: str) -> Tuple[int, int]:
+        """Append text and return its (offset, length) in the text file"""
+        encoded = text.encode('utf-8')
+        offset = self._text_offset
+        self._text.write(encoded)
+        self._text.flush()
+        self._text_offset += len(encoded)
+        return offset, len(encoded)
+
+    def add_transcript(self, sentence: int, text: str, start: Optional[float] = None, end: Optional[float] = None):
+        """
+        Record a final transcription.
+        :param sentence: Index of the entry in tc_sentences
+        :param start: Start time in seconds from session start (word timings), if known
+        :param end: End time in seconds, if known
+        """
+        with self._lock:
+            if self._closed:
+                return
+            start_sample = int(start * self.rate) if start is not None else self._last_end
+            end_sample = int(end * self.rate) if end is not None else self._total_samples
+            self._last_end = end_sample
+            offset, length = self._write_text(text)
+            record = np.array([(start_sample, end_sample, offset, length, sentence)], dtype=UTTERANCE_DTYPE)
+            self._transcripts.write(record.tobytes())
+            self._transcripts.flush()
+
+    def add_translation(self, sentence: int, text: str):
+        """Record a complete translation; it spans the audio of the matching transcript"""
+        with self._lock:
+            if self._closed:
+                return
+            offset, length = self._write_text(text)
+            record = np.array([(0, 0, offset, length, sentence)], dtype=UTTERANCE_DTYPE)
+            self._translations.write(record.tobytes())
+            self._translations.flush()
+
+    def close(self):
+        """Flush buffered audio and close all files"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._buffer:
+                self._flush_chunk(len(self._buffer))
+            for f in (self._audio, self._chunks, self._transcripts, self._translations, self._text):
+                f.close()
+        logging.info(f"Session  archive closed ({self._total_samples / self.rate:.1f}s of audio)")
+
+
+class SessionArchive:
+    """
+    Random-access reader for a recorded session.
+    Indexes are memory-mapped and searched in place, and only the audio chunks
+    covering a requested range are decompressed, so opening and seeking cost the
+    same for a minute-long or a multi-hour recording. Call close() (or use it as a
+    context manager) to release the maps; on Windows they lock the session files.
+    """
+
+    def __init__(self, session_dir: Path):
+        self.session_dir = Path(session_dir)
+        with open(self.session_dir / META_FILE, 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+        self.rate = self.meta["rate"]
+
+        self._maps = []  # Open mmap objects, closed by close()
+        self.chunks = self._map_index(CHUNK_INDEX_FILE, CHUNK_DTYPE)
+        self.transcripts = self._map_index(TRANSCRIPT_INDEX_FILE, UTTERANCE_DTYPE)
+        self.translations = self._map_index(TRANSLATION_INDEX_FILE, UTTERANCE_DTYPE)
+        self._audio = self._map_file(AUDIO_FILE)
+        self._text = self._map_file(TEXT_FILE)
+
+    def _map_index(self, name: str, dtype: np.dtype) -> np.ndarray:
+        """Memory-map an index file as a structured array (ignoring a torn last record)"""
+        path = self.session_dir / name
+        count = path.stat().st_size // dtype.itemsize
+        if count == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.frombuffer(self._map_file(name), dtype=dtype, count=count)
+
+    def _map_file(self, name: str):
+        """Memory-map a data file read-only"""
+        path = self.session_dir / name
+        if path.stat().st_size == 0:
+            return b""
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        return mapped
+
+    def close(self):
+        """Release the index arrays and close all memory maps"""
+        self.chunks = np.zeros(0, dtype=CHUNK_DTYPE)
+        self.transcripts = np.zeros(0, dtype=UTTERANCE_DTYPE)
+        self.translations = np.zeros(0, dtype=UTTERANCE_DTYPE)
+        self._audio = b""
+        self._text = b""
+        for mapped in self._maps:
+            try:
+                mapped.close()
+            except BufferError:
+                # A caller still holds a view of the index; the map closes once it is released
+                logging.warning(f"Session  archive map still in use: {self.session_dir}")
+        self._maps = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return len(self.transcripts)
+
+    @property
+    def duration(self) -> float:
+        """Recorded audio length in seconds"""
+        if not len(self.chunks):
+            return 0.0
+        last = self.chunks[-1]
+        return (int(last["start"]) + int(last["samples"])) / self.rate
+
+    def _read_text(self, record) -> str:
+        offset = int(record["text_offset"])
+        return self._text[offset:offset + int(record["text_length"])].decode('utf-8')
+
+    def sentence(self, index: int) -> dict:
+        """Return timing, transcript and translation of the sentence at index"""
+        record = self.transcripts[index]
+        translation = ""
+        pos = int(np.searchsorted(self.translations["sentence"], record["sentence"]))
+        if pos < len(self.translations) and self.translations[pos]["sentence"] == record["sentence"]:
+            translation = self._read_text(self.translations[pos])
+        return {
+            "start": int(record["start"]) / self.rate,
+            "end": int(record["end"]) / self.rate,
+            "transcript": self._read_text(record),
+            "translation": translation
+        }
+
+    def find(self, seconds: float) -> int:
+        """Index of the sentence playing at the given time (or the last one starting before it)"""
+        sample = int(seconds * self.rate)
+        idx = int(np.searchsorted(self.transcripts["start"], sample, side='right')) - 1
+        return max(idx, 0)
+
+    def read_audio(self, start: float, end: float) -> bytes:
+        """Return mono 16-bit PCM between two times, decompressing only the covering chunks"""
+        if not len(self.chunks):
+            return b""
+        start_sample = max(int(start * self.rate), 0)
+        end_sample = int(end * self.rate)
+        first = max(int(np.searchsorted(self.chunks["start"], start_sample, side='right')) - 1, 0)
+        last = int(np.searchsorted(self.chunks["start"], end_sample, side='left'))
+
+        pcm = bytearray()
+        for chunk in self.chunks[first:last]:
+            offset = int(chunk["offset"])
+            pcm += zlib.decompress(self._audio[offset:offset + int(chunk["length"])])
+        base = int(self.chunks[first]["start"])
+        return bytes(pcm[(start_sample - base) * 2:(end_sample - base) * 2])
+
+    def sentence_audio(self, index: int) -> bytes:
+        """Return the audio of the sentence at index"""
+        info = self.sentence(index)
+        return self.read_audio(info["start"], info["end"])
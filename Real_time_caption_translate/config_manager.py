@@ -3,9 +3,12 @@ import json
 import logging
 import os
 import sys
+import tempfile
+import threading
+import time
 from copy import deepcopy
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Callable, Optional
 
 # Configure logging system
 logging.basicConfig(
@@ -33,15 +36,37 @@ class ConfigHandler:
             "monitor_position": [0, 0],
             "deepl_key": "",
             "ollama_url": "localhost:11434",
-            "ollama_model": ""
+            "ollama_model": "",
+            "local_model_dir": "",
+            "glossary_path": "",
+            "glossary_grammar": False,
+            "record_sessions": False
         }
     }
 
+    SAVE_DELAY = 1.0  # Debounce window for background saves (seconds)
+    WATCH_INTERVAL = 1.0  # Polling interval for external edits (seconds)
+
     def __init__(self, config_name: str = "user_config.json"):
         self.config_path  = get_executable_dir() / config_name
         self.config  = deepcopy(self.DEFAULT_CONFIG)  # Prevent default value contamination
         self._convert_paths()
 
+        # _lock guards self.config and the pending save state and is only held for in-memory work,
+        # so the UI thread never waits on disk I/O. _write_lock serializes the file writes themselves.
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._save_deadline: Optional[float] = None  # time.monotonic() of the pending background save
+        self._save_wakeup = threading.Event()  # Set whenever the deadline changes
+        self._saver_thread: Optional[threading.Thread] = None
+        self._save_generation = 0  # Incremented for every serialized snapshot
+        self._written_generation = 0  # Generation of the snapshot currently on disk
+        self._last_written: Optional[str] = None  # Serialized content of our last write (or read)
+        self._file_signature = None  # (mtime_ns, size) of the file as last seen
+        self._watch_stop = threading.Event()
+        self._watch_thread: Optional[threading.Thread] = None
+        self._watched_files: Dict[str, Any] = {}  # key -> [path, signature, on_change]
+
     def _convert_paths(self):
         """Convert relative paths to absolute paths in configuration"""
         model_path = self.config["user_settings"]["model_dir"]
@@ -54,8 +79,11 @@ class ConfigHandler:
             if self.config_path.exists():
                 with open(self.config_path,  'r', encoding='utf-8') as f:
                     user_config = json.load(f)
+                with self._lock:
                     self._deep_merge(self.config,  user_config)
-                    logging.info("Configuration  loaded successfully")
+                with self._write_lock:
+                    self._file_signature = self._stat_signature()
+                logging.info("Configuration  loaded successfully")
             else:
                 self._ensure_config_dir()
                 self.save_config()
@@ -68,31 +96,227 @@ class ConfigHandler:
         return self.config
 
     def save_config(self, current_settings: dict = None):
-        """Safe configuration persistence with validation"""
+        """Safe synchronous configuration persistence with validation (flushes pending saves)"""
         try:
-            self._ensure_config_dir()
-            if current_settings:
-                self._validate_settings(current_settings)
-                self._deep_merge(self.config,  current_settings)
-
-            with open(self.config_path,  'w', encoding='utf-8') as f:
-                json.dump(self.config,  f, indent=4, ensure_ascii=False)
-                logging.info("Configuration  saved successfully")
+            with self._lock:
+                self._cancel_pending_save()
+                if current_settings:
+                    self._validate_settings(current_settings)
+                    self._deep_merge(self.config,  current_settings)
+                generation, content = self._serialize()
+            self._write_atomic(generation, content)
         except PermissionError as e:
             logging.error(f"Failed  to save configuration (permission denied): {e}")
         except Exception as e:
             logging.error(f"Error  saving configuration: {e}")
 
-    def _deep_merge(self, base: Dict[str, Any], update: Dict[str, Any]):
-        """Enhanced recursive merge algorithm for nested dictionaries"""
+    def schedule_save(self, current_settings: dict = None):
+        """
+        Merge settings in memory and persist them on a background thread after SAVE_DELAY.
+        Repeated calls within the window only push the deadline back and collapse into a
+        single write, so it is safe to call from the UI thread on every change (e.g. on
+        every <B1-Motion> while dragging the monitor window).
+        """
+        try:
+            with self._lock:
+                if current_settings:
+                    self._validate_settings(current_settings)
+                    self._deep_merge(self.config,  current_settings)
+                self._save_deadline = time.monotonic() + self.SAVE_DELAY
+                if self._saver_thread is None:
+                    self._saver_thread = threading.Thread(target=self._save_loop, daemon=True)
+                    self._saver_thread.start()
+            self._save_wakeup.set()
+        except Exception as e:
+            logging.error(f"Error  scheduling configuration save: {e}")
+
+    def _save_loop(self):
+        """Long-lived saver thread performing the debounced writes"""
+        while True:
+            with self._lock:
+                deadline = self._save_deadline
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            if self._save_wakeup.wait(timeout):
+                # Deadline moved or cancelled; re-read it
+                self._save_wakeup.clear()
+                continue
+            try:
+                with self._lock:
+                    if self._save_deadline is None or self._save_deadline > time.monotonic():
+                        continue
+                    self._save_deadline = None
+                    generation, content = self._serialize()
+                self._write_atomic(generation, content)
+            except Exception as e:
+                logging.error(f"Error  saving configuration: {e}")
+
+    def _cancel_pending_save(self):
+        """Cancel a scheduled background save, if any (caller holds _lock)"""
+        if self._save_deadline is not None:
+            self._save_deadline = None
+            self._save_wakeup.set()
+
+    def _serialize(self):
+        """Snapshot the configuration as JSON (caller holds _lock)"""
+        self._save_generation += 1
+        return self._save_generation, json.dumps(self.config,  indent=4, ensure_ascii=False)
+
+    def _write_atomic(self, generation: int, content: str):
+        """Write a serialized snapshot to a temporary file and rename it over the target"""
+        with self._write_lock:
+            if generation <= self._written_generation:
+                return  # A newer snapshot is already on disk
+            if content == self._last_written and self._stat_signature() == self._file_signature:
+                self._written_generation = generation
+                return  # Nothing changed since our last write or read
+
+            self._ensure_config_dir()
+            fd, tmp_path = tempfile.mkstemp(prefix=f".{self.config_path.name}.",  suffix=".tmp",
+                                            dir=self.config_path.parent)
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    f.write(content)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.config_path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+
+            self._written_generation = generation
+            self._last_written = content
+            self._file_signature = self._stat_signature()
+        logging.info("Configuration  saved successfully")
+
+    def _stat_signature(self):
+        """Return (mtime_ns, size) of the config file, or None if it does not exist"""
+        return self._file_stat(self.config_path)
+
+    @staticmethod
+    def _file_stat(path: Path):
+        """Return (mtime_ns, size) of a file, or None if it does not exist"""
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def start_watching(self, on_change: Callable[[Dict[str, Any]], None]):
+        """
+        Watch the config file for external edits and hot-reload them.
+        :param on_change: Called from the watcher thread with a copy of the reloaded configuration
+        """
+        if self._watch_thread and self._watch_thread.is_alive():
+            return
+        self._watch_stop.clear()
+        self._watch_thread = threading.Thread(target=self._watch_loop, args=(on_change,), daemon=True)
+        self._watch_thread.start()
+
+    def watch_file(self, key: str, path: str, on_change: Callable[[], None]):
+        """
+        Also watch a file referenced by the configuration (e.g. the glossary).
+        Replaces any previous watch under the same key; an empty path removes it.
+        :param on_change: Called from the watcher thread after the file was modified
+        """
+        with self._lock:
+            if not path:
+                self._watched_files.pop(key, None)
+                return
+            self._watched_files[key] = [Path(path), self._file_stat(Path(path)), on_change]
+
+    def stop_watching(self):
+        """Stop the file watcher thread"""
+        self._watch_stop.set()
+        if self._watch_thread and self._watch_thread.is_alive():
+            self._watch_thread.join(timeout=2)
+        self._watch_thread = None
+
+    def _watch_loop(self, on_change: Callable[[Dict[str, Any]], None]):
+        """Poll the config file and watched files, reloading on external modification"""
+        while not self._watch_stop.wait(self.WATCH_INTERVAL):
+            self._check_config(on_change)
+            self._check_watched_files()
+
+    def _check_watched_files(self):
+        """Notify listeners of watched files whose signature changed"""
+        with self._lock:
+            watched = list(self._watched_files.values())
+        for entry in watched:
+            path, signature, callback = entry
+            current = self._file_stat(path)
+            if current == signature:
+                continue
+            entry[1] = current
+            if current is None:
+                continue
+            try:
+                callback()
+            except Exception as e:
+                logging.error(f"Error  handling change of {path}: {e}")
+
+    def _check_config(self, on_change: Callable[[Dict[str, Any]], None]):
+        """Reload the config file if it was modified externally"""
+        signature = self._stat_signature()
+        with self._write_lock:
+            if signature is None or signature == self._file_signature:
+                return
+        try:
+            with open(self.config_path,  'r', encoding='utf-8') as f:
+                user_config = json.load(f)
+        except json.JSONDecodeError as e:
+            # Likely a half-finished external edit; retry on the next change
+            logging.error(f"Configuration  file format error: {e}, keeping current settings")
+            with self._write_lock:
+                self._file_signature = signature
+            return
+        except Exception as e:
+            logging.error(f"Error  reloading configuration: {e}")
+            return
+
+        with self._lock:
+            self._deep_merge(self.config,  user_config)
+            snapshot = deepcopy(self.config)
+            content = json.dumps(self.config,  indent=4, ensure_ascii=False)
+        with self._write_lock:
+            # Content read from disk counts as written, so re-saving it is skipped
+            self._file_signature = signature
+            self._last_written = content
+        logging.info("Configuration  reloaded from disk")
+        try:
+            on_change(snapshot)
+        except Exception as e:
+            logging.error(f"Error  applying reloaded configuration: {e}")
+
+    def _deep_merge(self, base: Dict[str, Any], update: Dict[str, Any], schema: Dict[str, Any] = None):
+        """
+        Schema-aware recursive merge following DEFAULT_CONFIG.
+        Unknown keys and values of the wrong type are ignored; lists are replaced, not concatenated.
+        """
+        if schema is None:
+            schema = self.DEFAULT_CONFIG
         for key, value in update.items():
-            if isinstance(value, dict):
-                node = base.setdefault(key,  {})
-                self._deep_merge(node, value)
-            elif isinstance(value, list):
-                base[key] = base.get(key,  []) + value
-            else:
+            if key not in schema:
+                logging.warning(f"Ignoring  unknown configuration key: {key}")
+                continue
+            default = schema[key]
+            if isinstance(default, dict):
+                if isinstance(value, dict):
+                    node = base.setdefault(key,  {})
+                    self._deep_merge(node, value, default)
+                else:
+                    logging.warning(f"Ignoring  invalid configuration section: {key}")
+            elif isinstance(default, list):
+                if isinstance(value, list):
+                    base[key] = list(value)
+                else:
+                    logging.warning(f"Ignoring  invalid configuration value for {key}: {value!r}")
+            elif isinstance(value, type(default)) and not isinstance(value, (dict, list)):
                 base[key] = value
+            else:
+                logging.warning(f"Ignoring  invalid configuration value for {key}: {value!r}")
 
     def _ensure_config_dir(self):
         """Ensure configuration directory exists"""
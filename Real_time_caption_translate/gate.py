@@ -0,0 +1,82 @@
+# gate.py
+from typing import Any, Dict, List, Optional, Tuple
+
+# Emitted by a grammar-restricted recognizer for speech outside the phrase list
+UNKNOWN_WORD = "[unk]"
+
+
+def strip_unknown(text: str) -> str:
+    """Remove [unk] tokens from a hypothesis text"""
+    return " ".join(w for w in text.split() if w != UNKNOWN_WORD)
+
+
+def drop_unknown(words: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Remove [unk] entries from a word list"""
+    return [w for w in words if w.get("word") != UNKNOWN_WORD]
+
+
+def parse_final(result: Dict[str, Any]) -> Tuple[str, List[Dict[str, Any]], float]:
+    """
+    Extract text, word timings and confidence from a final Result().
+    [unk] tokens are dropped, so a result made only of them comes back empty.
+    :return: (text, words, confidence), confidence being the mean word confidence in [0, 1]
+    """
+    words = drop_unknown(result.get("result", []))
+    confidence = sum(w.get("conf", 1.0) for w in words) / len(words) if words else 1.0
+    return strip_unknown(result.get("text", "")), words, confidence
+
+
+class PartialGate:
+    """
+    Decide which partial hypotheses are worth translating.
+    A partial passes once its leading words have not been revised for STABLE_UPDATES
+    consecutive updates, it holds at least MIN_WORDS stable words and their mean
+    confidence reaches MIN_CONFIDENCE. Final results bypass the gate.
+    """
+    MIN_CONFIDENCE = 0.6  # Mean word confidence required for a partial
+    MIN_WORDS = 2  # Skip one-word fragments
+    STABLE_UPDATES = 2  # Consecutive updates without revising the stable prefix
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Forget the current hypothesis (after a final result or released clause)"""
+        self._previous = []  # Words of the previous partial update
+        self._stable_len = 0  # Length of the prefix shared with the previous update
+        self._stable_updates = 0  # Consecutive updates that kept the stable prefix
+        self._last_emitted = ""
+
+    def feed(self, words: List[Dict[str, Any]]) -> Optional[str]:
+        """
+        Process a partial update.
+        :param words: Pending "partial_result" words (each with "word" and optionally "conf")
+        :return: Stable text to translate, or None if the partial should be skipped
+        """
+        tokens = [w["word"] for w in words]
+        common = 0
+        for a, b in zip(tokens, self._previous):
+            if a != b:
+                break
+            common += 1
+
+        if common >= self._stable_len and common > 0:
+            self._stable_updates += 1
+        else:
+            self._stable_updates = 0
+        self._stable_len = common
+        self._previous = tokens
+
+        if self._stable_updates < self.STABLE_UPDATES or common < self.MIN_WORDS:
+            return None
+
+        stable = words[:common]
+        confidence = sum(w.get("conf", 1.0) for w in stable) / len(stable)
+        if confidence < self.MIN_CONFIDENCE:
+            return None
+
+        text = " ".join(tokens[:common])
+        if text == self._last_emitted:
+            return None
+        self._last_emitted = text
+        return text
@@ -0,0 +1,206 @@
+# glossary.py
+import logging
+import re
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Placeholder standing in for a protected term while the engine translates;
+# a nonsense word that engines pass through unchanged like a proper noun. The closing
+# "Q" keeps digits that follow the term (once an engine drops the space) out of the index.
+PLACEHOLDER = "ZQX{}Q"
+PLACEHOLDER_PATTERN = re.compile(r"Z\s*Q\s*X\s*(\d+)\s*Q", re.IGNORECASE)
+
+
+def fold_case(text: str) -> str:
+    """Lowercase per character without changing the length, so offsets map back to the original text"""
+    return "".join(lowered if len(lowered) == 1 else ch for ch, lowered in ((ch, ch.lower()) for ch in text))
+
+
+class TermMatcher:
+    """
+    Precompiled Aho-Corasick automaton replacing whole-word phrases in a single pass.
+    Matching is case-insensitive; overlapping matches resolve to the leftmost-longest one.
+    """
+
+    def __init__(self, replacements: Dict[str, str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[int, str]]] = [[]]  # (pattern length, replacement) ending at each node
+        self._size = 0
+
+        for pattern, replacement in replacements.items():
+            pattern = fold_case(pattern.strip())
+            if pattern:
+                self._add(pattern, replacement)
+        self._build_links()
+
+    def __len__(self):
+        return self._size
+
+    def _add(self, pattern: str, replacement: str):
+        """Insert a pattern into the trie"""
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = nxt
+        if not self._output[node]:
+            self._size += 1
+        self._output[node] = [(len(pattern), replacement)]
+
+    def _build_links(self):
+        """Compute failure links breadth-first and merge suffix outputs into each node"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def find(self, text: str) -> List[Tuple[int, int, str]]:
+        """Return non-overlapping whole-word matches as (start, end, replacement)"""
+        lowered = fold_case(text)
+        candidates = []
+        node = 0
+        for i, ch in enumerate(lowered):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+
+            for length, replacement in self._output[node]:
+                start = i - length + 1
+                end = i + 1
+                if self._is_boundary(lowered, start - 1) and self._is_boundary(lowered, end):
+                    candidates.append((start, end, replacement))
+
+        # Leftmost-longest, non-overlapping
+        candidates.sort(key=lambda m: (m[0], m[0] - m[1]))
+        matches = []
+        last_end = 0
+        for start, end, replacement in candidates:
+            if start >= last_end:
+                matches.append((start, end, replacement))
+                last_end = end
+        return matches
+
+    @staticmethod
+    def _is_boundary(text: str, idx: int) -> bool:
+        """True if idx is outside the text or not part of a word"""
+        return idx < 0 or idx >= len(text) or not text[idx].isalnum()
+
+    def replace(self, text: str) -> str:
+        """Replace every matched phrase with its replacement"""
+        if not text:
+            return text
+        parts = []
+        last = 0
+        for start, end, replacement in self.find(text):
+            parts.append(text[last:start])
+            parts.append(replacement)
+            last = end
+        if not parts:
+            return text
+        parts.append(text[last:])
+        return "".join(parts)
+
+
+class Glossary:
+    """
+    User terminology loaded from a tab-separated file, one entry per line:
+        term<TAB>translation<TAB>alias|alias
+    Translation and aliases are optional; lines starting with '#' are ignored.
+    Aliases are known misrecognitions corrected back to the term, and terms are
+    hidden behind placeholders during machine translation and restored as their
+    fixed translation afterwards.
+    """
+
+    def __init__(self, entries: List[Tuple[str, str, List[str]]]):
+        self.entries = entries
+        corrections = {}
+        substitutions = {}
+        for term, translation, aliases in entries:
+            for alias in aliases:
+                corrections[alias] = term
+            if translation:
+                substitutions[term] = translation
+                for alias in aliases:
+                    substitutions[alias] = translation
+        self.recognition = TermMatcher(corrections)
+        self.translation = TermMatcher(substitutions)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["Glossary"]:
+        """Load a glossary file, returning None if no usable file is configured"""
+        if not path:
+            return None
+        entries = []
+        try:
+            with open(Path(path), 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.rstrip("\n")
+                    if not line.strip() or line.lstrip().startswith("#"):
+                        continue
+                    fields = line.split("\t")
+                    term = fields[0].strip()
+                    translation = fields[1].strip() if len(fields) > 1 else ""
+                    aliases = [a.strip() for a in fields[2].split("|") if a.strip()] if len(fields) > 2 else []
+                    if term:
+                        entries.append((term, translation, aliases))
+        except (OSError, UnicodeDecodeError) as e:
+            logging.error(f"Failed  to load glossary {path}: {e}")
+            return None
+        logging.info(f"Glossary  loaded with {len(entries)} entries")
+        return cls(entries)
+
+    def correct(self, text: str) -> str:
+        """Replace known misrecognitions with the canonical term"""
+        return self.recognition.replace(text)
+
+    def protect(self, text: str) -> Tuple[str, List[str]]:
+        """
+        Replace glossary terms with placeholders before machine translation.
+        :return: (protected text, fixed translations indexed by placeholder number)
+        """
+        parts = []
+        targets = []
+        last = 0
+        for start, end, translation in self.translation.find(text):
+            parts.append(text[last:start])
+            parts.append(PLACEHOLDER.format(len(targets)))
+            targets.append(translation)
+            last = end
+        if not targets:
+            return text, targets
+        parts.append(text[last:])
+        return "".join(parts), targets
+
+    @staticmethod
+    def restore(translated: str, targets: List[str]) -> str:
+        """Put the fixed term translations back in place of the placeholders"""
+        if not targets:
+            return translated
+
+        def substitute(match):
+            idx = int(match.group(1))
+            return targets[idx] if idx < len(targets) else match.group(0)
+
+        return PLACEHOLDER_PATTERN.sub(substitute, translated)
+
+    def phrases(self) -> List[str]:
+        """Lowercase phrases for a Vosk grammar (terms and their aliases)"""
+        phrases = []
+        for term, _, aliases in self.entries:
+            phrases.append(term.lower())
+            phrases.extend(alias.lower() for alias in aliases)
+        return phrases
@@ -15,8 +15,15 @@ else:
 
 import logging
 
-from Real_time_caption_translate.config_manager import ConfigHandler
-from Real_time_caption_translate.translator import tl_api, DEEPL_LANGUAGE_TO_CODE, GOOGLE_LANGUAGES_TO_CODES
+from Real_time_caption_translate.config_manager import ConfigHandler, get_executable_dir
+from Real_time_caption_translate.translator import (tl_api, tl_api_batch, preload_local_translator,
+                                                    DEEPL_LANGUAGE_TO_CODE, GOOGLE_LANGUAGES_TO_CODES,
+                                                    LOCAL_LANGUAGES_TO_CODES)
+from Real_time_caption_translate.settings import SettingsPublisher, build_settings
+from Real_time_caption_translate.segmenter import ClauseSegmenter, join_clauses
+from Real_time_caption_translate.gate import PartialGate, drop_unknown, parse_final, strip_unknown
+from Real_time_caption_translate.glossary import Glossary
+from Real_time_caption_translate.archive import SessionRecorder
 
 from vosk import Model, KaldiRecognizer
 
@@ -52,12 +59,17 @@ class Mainloop:
         self.stream = None
         self.p = None
         self.rec = None
+        self.recorder = None  # Session archive writer while transcribing
         self.chuck = 4096
         self.tc_sentences = []  # List to store complete transcribed sentences
         self.tl_sentences = []  # List to store complete translated sentences
+        self.tl_clauses = []  # Translated clauses of the sentence in progress
+        self.segmenter = ClauseSegmenter()
+        self.partial_gate = PartialGate()
 
         self.model_dir_var = tk.StringVar(value=self.current_config["user_settings"]["model_dir"])
-        self.translation_queue = deque(maxlen=2)  # Queue with a maximum length of 2
+        # Unbounded so final and clause tasks are never dropped; partials are only queued when it is empty
+        self.translation_queue = deque()
         self.data_queue = deque(maxlen=10)
         self.queue_lock = threading.Lock()  # Thread lock for queue access
 
@@ -66,21 +78,39 @@ class Mainloop:
 
         self.engine = self.current_config["user_settings"]["engine"]
         self.current_engine_var = tk.StringVar(value=self.engine)
+        self.source_lang_var = tk.StringVar(value=self.source_lang)
+        self.target_lang_var = tk.StringVar(value=self.target_lang)
 
         # StringVars for engine-specific settings
         self.deepl_key_var = tk.StringVar(value=self.current_config["user_settings"]["deepl_key"])
         self.ollama_url_var = tk.StringVar(value=self.current_config["user_settings"]["ollama_url"])
         self.ollama_model_var = tk.StringVar(value=self.current_config["user_settings"]["ollama_model"])
+        self.local_model_dir_var = tk.StringVar(value=self.current_config["user_settings"]["local_model_dir"])
+
+        # Terminology glossary shared by recognition and translation
+        self.glossary_path_var = tk.StringVar(value=self.current_config["user_settings"]["glossary_path"])
+        self.glossary_grammar_var = tk.BooleanVar(value=self.current_config["user_settings"]["glossary_grammar"])
+        self.glossary = Glossary.load(self.glossary_path_var.get())
+
+        self.record_sessions_var = tk.BooleanVar(value=self.current_config["user_settings"]["record_sessions"])
 
         # Engine-specific language dictionaries
         self.engine_lang_dicts = {
             "Google": GOOGLE_LANGUAGES_TO_CODES,
             "DeepL": DEEPL_LANGUAGE_TO_CODE,
-            "Ollama": GOOGLE_LANGUAGES_TO_CODES  # Could be empty or minimal if no selection needed
+            "Ollama": GOOGLE_LANGUAGES_TO_CODES,  # Could be empty or minimal if no selection needed
+            "Local": LOCAL_LANGUAGES_TO_CODES
         }
         self.lang_dict = self.engine_lang_dicts.get(self.engine,
                                                     DEEPL_LANGUAGE_TO_CODE)  # Default to DeepL if engine not found
 
+        # Immutable settings snapshot read by the translation thread
+        self.settings = SettingsPublisher()
+        self.publish_settings()
+        for var in (self.current_engine_var, self.source_lang_var, self.target_lang_var,
+                    self.deepl_key_var, self.ollama_url_var, self.ollama_model_var, self.local_model_dir_var):
+            var.trace_add("write", self.publish_settings)
+
         # Monitor window properties
         self.monitor_window = None
 
@@ -96,6 +126,16 @@ class Mainloop:
         # Scan audio devices on initialization
         self.scan_audio_devices()
 
+        # Persist changes in the background and hot-reload external edits
+        self._applying_config = False
+        for var in (self.current_engine_var, self.source_lang_var, self.target_lang_var,
+                    self.deepl_key_var, self.ollama_url_var, self.ollama_model_var, self.model_dir_var,
+                    self.local_model_dir_var, self.glossary_path_var, self.glossary_grammar_var,
+                    self.record_sessions_var):
+            var.trace_add("write", self.schedule_config_save)
+        self.config_handler.start_watching(lambda config: self.root.after(0, self.apply_config, config))
+        self.watch_glossary_file()
+
     def scan_audio_devices(self):
         """Scan available audio input devices."""
         self.audio_devices = []
@@ -173,15 +213,15 @@ class Mainloop:
 
         # Source language selector
         ttk.Label(toolbar, text="Source Language:").pack(side=tk.LEFT, padx=5)
-        self.source_lang_selector = ttk.Combobox(toolbar, values=list(self.lang_dict.keys()))
+        self.source_lang_selector = ttk.Combobox(toolbar, values=list(self.lang_dict.keys()),
+                                                 textvariable=self.source_lang_var)
         self.source_lang_selector.pack(side=tk.LEFT, padx=5)
-        self.source_lang_selector.set(self.source_lang)
 
         # Target language selector
         ttk.Label(toolbar, text="Target Language:").pack(side=tk.LEFT, padx=5)
-        self.target_lang_selector = ttk.Combobox(toolbar, values=list(self.lang_dict.keys()))
+        self.target_lang_selector = ttk.Combobox(toolbar, values=list(self.lang_dict.keys()),
+                                                 textvariable=self.target_lang_var)
         self.target_lang_selector.pack(side=tk.LEFT, padx=5)
-        self.target_lang_selector.set(self.target_lang)
 
         # Start/Stop button
         self.start_stop_btn = ttk.Button(toolbar, text="Start", command=self.toggle_transcription)
@@ -280,6 +320,7 @@ class Mainloop:
         x = self.monitor_window.winfo_x() + (event.x - self.drag_data["x"])
         y = self.monitor_window.winfo_y() + (event.y - self.drag_data["y"])
         self.monitor_window.geometry(f"+{x}+{y}")
+        self.schedule_config_save()
 
     def start_drag(self, event):
         """Record the starting point for dragging."""
@@ -311,6 +352,9 @@ class Mainloop:
             self.translation_queue.clear()
         self.tc_sentences.clear()
         self.tl_sentences.clear()
+        self.tl_clauses = []
+        self.segmenter.reset()
+        self.partial_gate.reset()
 
         self.is_transcribing = True
         self.start_stop_btn.config(text="Stop")
@@ -342,7 +386,21 @@ class Mainloop:
 
 
         model = Model(self.model_dir_var.get())
-        self.rec = KaldiRecognizer(model, self.transcribe_device["rate"])
+        if self.glossary_grammar_var.get() and self.glossary:
+            # Restricted phrase list; only models with a dynamic graph (e.g. small models) honour it
+            grammar = json.dumps(self.glossary.phrases() + ["[unk]"], ensure_ascii=False)
+            self.rec = KaldiRecognizer(model, self.transcribe_device["rate"], grammar)
+        else:
+            self.rec = KaldiRecognizer(model, self.transcribe_device["rate"])
+        # Word timings drive clause segmentation of long hypotheses
+        self.rec.SetWords(True)
+        self.rec.SetPartialWords(True)
+
+        if self.record_sessions_var.get():
+            session_dir = get_executable_dir() / "sessions" / time.strftime("%Y%m%d-%H%M%S")
+            self.recorder = SessionRecorder(session_dir, self.transcribe_device["rate"])
+
+        self.preload_engine()
 
         # Start transcription and translation threads
         self.transcription_thread = threading.Thread(target=self.transcription_loop, daemon=True)
@@ -377,6 +435,11 @@ class Mainloop:
         self.p = None
         self.rec = None
 
+        # Worker threads may still hold the recorder; its methods are no-ops once closed
+        recorder, self.recorder = self.recorder, None
+        if recorder:
+            recorder.close()
+
         logging.info("Transcription stopped.")
         self.start_stop_btn.config(text="Start")
 
@@ -406,26 +469,59 @@ class Mainloop:
                     continue
                 data = self.data_queue.popleft()
                 data = self.convert_to_mono(data, self.transcribe_device["channels"])
+                recorder = self.recorder
+                if recorder:
+                    recorder.write_audio(data)
+                settings = self.settings.current
+                glossary = settings.glossary if settings else None
                 if self.rec.AcceptWaveform(data):
                     result = json.loads(self.rec.Result())
-                    text = result.get("text", "")
+                    text, words, _ = parse_final(result)
+                    if not text and self.segmenter.committed_count:
+                        # The final came back empty; the released clauses are the whole sentence
+                        text = self.segmenter.committed_text()
+                    remainder = self.segmenter.feed_final(words, text)
+                    self.partial_gate.reset()
+                    if glossary:
+                        text = glossary.correct(text)
+                        remainder = glossary.correct(remainder)
                     if text:
                         self.tc_sentences.append(text)
                         self.root.after(0, self.update_source_text, text, True)
+                        if recorder:
+                            start = words[0]["start"] if words else None
+                            end = words[-1]["end"] if words else None
+                            recorder.add_transcript(len(self.tc_sentences) - 1, text, start, end)
 
-                        tl_task = {"text": text, "flag": True}
-                        self.translation_queue.append(tl_task)
+                        # Closes the sentence; clauses released earlier are stitched in front of it
+                        tl_task = {"text": remainder, "flag": True, "sentence": len(self.tc_sentences) - 1}
+                        with self.queue_lock:
+                            self.translation_queue.append(tl_task)
 
                 else:
                     if self.rec:
                         partial = json.loads(self.rec.PartialResult())
-                        partial_text = partial.get("partial", "")
+                        partial_text = strip_unknown(partial.get("partial", ""))
                         if partial_text:
-                            self.root.after(0, self.update_source_text, partial_text, False)
-
-                            if not self.translation_queue:
-                                tl_task = {"text": partial_text, "flag": False}
-                                self.translation_queue.append(tl_task)
+                            display_text = glossary.correct(partial_text) if glossary else partial_text
+                            self.root.after(0, self.update_source_text, display_text, False)
+
+                            words = (drop_unknown(partial.get("partial_result", []))
+                                     or [{"word": w} for w in partial_text.split()])
+                            clauses = self.segmenter.feed_partial(words)
+                            if clauses:
+                                self.partial_gate.reset()
+                            # Only stable, confident partials are worth a translation call
+                            candidate = self.partial_gate.feed(self.segmenter.pending_words(words))
+                            if glossary:
+                                clauses = [glossary.correct(clause) for clause in clauses]
+                                candidate = glossary.correct(candidate) if candidate else candidate
+                            with self.queue_lock:
+                                for clause in clauses:
+                                    self.translation_queue.append({"text": clause, "flag": False, "clause": True})
+                                if candidate and not self.translation_queue:
+                                    tl_task = {"text": candidate, "flag": False}
+                                    self.translation_queue.append(tl_task)
 
             except Exception as e:
                 print(f"Transcription error: {e}")
@@ -433,39 +529,93 @@ class Mainloop:
 
     def translation_loop(self):
         while self.is_transcribing:
-            task = None
+            # Read the published snapshot once per batch; never touch Tk variables here.
+            # Without one, tasks stay queued until the languages can be resolved.
+            settings = self.settings.current
+            if settings is None:
+                time.sleep(0.1)
+                continue
+
+            tasks = []
             with self.queue_lock:
-                if self.translation_queue:
-                    task = self.translation_queue.popleft()
+                while self.translation_queue:
+                    tasks.append(self.translation_queue.popleft())
 
-            if task:
+            if tasks:
+                handled = 0  # Tasks already applied, in order
+                lang_target = ""
                 try:
-                    engine = self.current_engine_var.get()
-                    kwargs = {}
-                    if engine != "Ollama":
-                        source_lang_code = self.lang_dict[self.source_lang_selector.get()]
-                        target_lang_code = self.lang_dict[self.target_lang_selector.get()]
-                        kwargs["lang_source"] = source_lang_code
-                        kwargs["lang_target"] = target_lang_code
-                    if engine == "DeepL":
-                        kwargs["api_key"] = self.deepl_key_var.get()
-                    elif engine == "Ollama":
-                        kwargs["url"] = self.ollama_url_var.get()
-                        kwargs["model"] = self.ollama_model_var.get()
-                        kwargs["lang_target"] = self.target_lang_selector.get()
-
-                    if task['flag']:
-                        translated = tl_api(engine=engine, text=task['text'], **kwargs)
-                        self.tl_sentences.append(translated)
-                        self.root.after(0, self.update_translated_text, translated, True)
-                    else:
-                        translated = tl_api(engine=engine, text=task['text'], **kwargs)
-                        self.root.after(0, self.update_translated_text, translated, False)
+                    texts = [task['text'] for task in tasks if task['text']]
+                    term_targets = [[] for _ in texts]
+                    if settings.glossary:
+                        # Hide glossary terms behind placeholders so the engine cannot rewrite them
+                        protected = [settings.glossary.protect(text) for text in texts]
+                        texts = [text for text, _ in protected]
+                        term_targets = [targets for _, targets in protected]
+                    results = iter([Glossary.restore(result, targets) if result is not None else None
+                                    for result, targets in zip(self.translate_texts(settings, texts), term_targets)])
+
+                    lang_target = settings.kwargs.get("lang_target", "")
+                    for task in tasks:
+                        translated = next(results) if task['text'] else ""
+                        handled += 1
+                        if translated is None and not task['flag']:
+                            continue  # A lost clause or partial only leaves a gap on the overlay
+                        if task.get('clause'):
+                            self.tl_clauses.append(translated)
+                            self.root.after(0, self.update_translated_clause, translated,
+                                            join_clauses(self.tl_clauses, lang_target))
+                        elif task['flag']:
+                            self.close_sentence(task, translated, lang_target)
+                        else:
+                            # Keep released clauses on the overlay in front of the pending fragment
+                            self.root.after(0, self.update_translated_text, translated, False,
+                                            join_clauses(self.tl_clauses + [translated], lang_target))
                 except Exception as e:
                     print(f"Translation error: {e}")
+                    # Still close the sentences of the unapplied tasks
+                    for task in tasks[handled:]:
+                        if task['flag']:
+                            self.close_sentence(task, None, lang_target)
             else:
                 time.sleep(0.1)
 
+    def close_sentence(self, task, translated, lang_target):
+        """
+        Stitch released clauses and the final remainder back into one sentence.
+        A failed remainder (None) still closes the sentence with the clauses alone, so later
+        sentences are not stitched onto them and tl_sentences stays aligned with tc_sentences.
+        """
+        translated = translated or ""
+        sentence = join_clauses(self.tl_clauses + [translated], lang_target)
+        self.tl_clauses = []
+        self.tl_sentences.append(sentence)
+        recorder = self.recorder
+        if recorder:
+            recorder.add_translation(task['sentence'], sentence)
+        self.root.after(0, self.update_translated_text, translated, True)
+
+    def translate_texts(self, settings, texts):
+        """
+        Translate a drained batch of texts.
+        If the batch call fails each text is retried on its own, so one bad task
+        cannot take the rest of the batch down with it.
+        :return: Translations in order, None for texts that could not be translated
+        """
+        if len(texts) > 1:
+            try:
+                return list(tl_api_batch(settings.engine, texts, **settings.kwargs))
+            except Exception as e:
+                print(f"Batch translation error: {e}")
+        results = []
+        for text in texts:
+            try:
+                results.append(tl_api(engine=settings.engine, text=text, **settings.kwargs))
+            except Exception as e:
+                print(f"Translation error: {e}")
+                results.append(None)
+        return results
+
     def update_source_text(self, text, is_complete):
         """Update the transcription text area."""
         self.source_text.config(state="normal")
@@ -482,7 +632,7 @@ class Mainloop:
         # self.source_text.bindtags((self.source_text, self.root, "all"))
 
 
-    def update_translated_text(self, text, is_complete):
+    def update_translated_text(self, text, is_complete, monitor_text=None):
         """Main loop for translating transcribed text."""
         self.translated_text.config(state="normal")
 
@@ -492,12 +642,20 @@ class Mainloop:
         else:
             self._clear_translated_partial_text()
             self.translated_text.insert("end", text + " ", "partial")
-            self._update_monitor_text(self.partial_translation,text + " ")
+            self._update_monitor_text(self.partial_translation, (monitor_text or text) + " ")
 
         # self.translated_text.config(state="disabled")
         # self.translated_text.bindtags((self.translated_text, self.root, "all"))
 
 
+    def update_translated_clause(self, text, sentence_so_far):
+        """Append a translated clause of the sentence in progress."""
+        self.translated_text.config(state="normal")
+        self._clear_translated_partial_text()
+        if text:
+            self.translated_text.insert("end", text + " ")
+        self._update_monitor_text(self.partial_translation, sentence_so_far + " ")
+
     def _update_monitor_text(self, widget, text):
         """Update text in the monitor window."""
         widget.config(state='normal')
@@ -565,6 +723,14 @@ class Mainloop:
         browse_btn = ttk.Button(path_frame, text="Browse...", width=8, command=self.browse_model_dir)
         browse_btn.pack(side=tk.RIGHT, padx=5)
 
+        grammar_check = ttk.Checkbutton(parent, text="Restrict recognition to glossary phrases",
+                                        variable=self.glossary_grammar_var)
+        grammar_check.grid(row=2, column=1, sticky=tk.W)
+
+        record_check = ttk.Checkbutton(parent, text="Archive sessions (audio and captions)",
+                                       variable=self.record_sessions_var)
+        record_check.grid(row=3, column=1, sticky=tk.W)
+
     def browse_model_dir(self):
         """Open a directory selection dialog for the model path."""
         selected_dir = filedialog.askdirectory(title="Select Speech Model Directory",
@@ -572,17 +738,25 @@ class Mainloop:
         if selected_dir:
             self.model_dir_var.set(selected_dir)
 
+    def browse_local_model_dir(self):
+        """Open a directory selection dialog for the local translation model path."""
+        selected_dir = filedialog.askdirectory(title="Select Translation Model Directory",
+                                               initialdir=self.local_model_dir_var.get())
+        if selected_dir:
+            self.local_model_dir_var.set(selected_dir)
+
     def on_device_select(self, event):
         """Handle audio device selection."""
         selected_idx = self.input_devices.current()
         if selected_idx >= 0 and selected_idx < len(self.audio_devices):
             self.transcribe_device = self.audio_devices[selected_idx]
             print(f"Selected device{self.transcribe_device['name']}")
+            self.schedule_config_save()
 
     def create_translation_settings(self, parent):
         """Create the translation settings interface."""
         ttk.Label(parent, text="Translation Engine:").grid(row=0, column=0, sticky=tk.W)
-        self.trans_engine = ttk.Combobox(parent, values=["Google", "DeepL", "Ollama"], textvariable=self.current_engine_var)
+        self.trans_engine = ttk.Combobox(parent, values=list(self.engine_lang_dicts.keys()), textvariable=self.current_engine_var)
         self.trans_engine.grid(row=0, column=1, sticky=tk.EW)
         self.trans_engine.bind("<<ComboboxSelected>>", self.on_engine_select)
 
@@ -593,6 +767,51 @@ class Mainloop:
         # Initial update of settings frame
         self.update_engine_settings()
 
+        ttk.Label(parent, text="Glossary File:").grid(row=2, column=0, sticky=tk.W)
+        glossary_frame = ttk.Frame(parent)
+        glossary_frame.grid(row=2, column=1, sticky=tk.EW)
+
+        entry = ttk.Entry(glossary_frame, textvariable=self.glossary_path_var, width=40)
+        entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        # Reload once editing is done rather than on every keystroke
+        entry.bind("<FocusOut>", self.reload_glossary)
+        entry.bind("<Return>", self.reload_glossary)
+
+        browse_btn = ttk.Button(glossary_frame, text="Browse...", width=8, command=self.browse_glossary_file)
+        browse_btn.pack(side=tk.RIGHT, padx=5)
+
+    def browse_glossary_file(self):
+        """Open a file selection dialog for the glossary file."""
+        selected_file = filedialog.askopenfilename(title="Select Glossary File",
+                                                   filetypes=[("Tab-separated glossary", "*.tsv *.txt"),
+                                                              ("All files", "*.*")])
+        if selected_file:
+            self.glossary_path_var.set(selected_file)
+            self.reload_glossary()
+
+    def reload_glossary(self, *args):
+        """Load the glossary on a background thread and publish it when ready."""
+        path = self.glossary_path_var.get()
+        self.watch_glossary_file()
+
+        def load():
+            glossary = Glossary.load(path)
+            self.root.after(0, self._set_glossary, path, glossary)
+
+        threading.Thread(target=load, daemon=True).start()
+
+    def _set_glossary(self, path, glossary):
+        """Install a loaded glossary unless the path changed in the meantime."""
+        if path != self.glossary_path_var.get():
+            return
+        self.glossary = glossary
+        self.publish_settings()
+
+    def watch_glossary_file(self):
+        """Reload the glossary whenever its file changes on disk."""
+        self.config_handler.watch_file("glossary", self.glossary_path_var.get(),
+                                       lambda: self.root.after(0, self.reload_glossary))
+
     def on_engine_select(self, event):
         """Handle engine selection change."""
         self.update_engine_settings()
@@ -616,11 +835,18 @@ class Mainloop:
             ttk.Label(self.engine_settings_frame, text="Model Name:").grid(row=1, column=0, sticky=tk.W)
             self.ollama_model_entry = ttk.Entry(self.engine_settings_frame, textvariable=self.ollama_model_var, width=35)
             self.ollama_model_entry.grid(row=1, column=1, sticky=tk.EW)
+        elif engine == "Local":
+            ttk.Label(self.engine_settings_frame, text="Translation Model Path:").grid(row=0, column=0, sticky=tk.W)
+            self.local_model_entry = ttk.Entry(self.engine_settings_frame, textvariable=self.local_model_dir_var, width=35)
+            self.local_model_entry.grid(row=0, column=1, sticky=tk.EW)
+            browse_btn = ttk.Button(self.engine_settings_frame, text="Browse...", width=8,
+                                    command=self.browse_local_model_dir)
+            browse_btn.grid(row=0, column=2, padx=5)
         # For Google, no additional settings
 
     def update_language_selectors(self):
         """Update language selectors based on selected engine."""
-        engine = self.trans_engine.get()
+        engine = self.current_engine_var.get()
 
         self.source_lang_selector.config(state="normal")
         self.target_lang_selector.config(state="normal")
@@ -629,15 +855,43 @@ class Mainloop:
             languages = list(self.lang_dict.keys())
             self.source_lang_selector['values'] = languages
             self.target_lang_selector['values'] = languages
-            # Set to current languages if available, else first option
+            # Keep the currently selected languages if available, else first option
+            source_lang = self.source_lang_var.get()
+            target_lang = self.target_lang_var.get()
             self.source_lang_selector.set(
-                self.source_lang if self.source_lang in languages else languages[0] if languages else "")
+                source_lang if source_lang in languages else languages[0] if languages else "")
             self.target_lang_selector.set(
-                self.target_lang if self.target_lang in languages else languages[0] if languages else "")
+                target_lang if target_lang in languages else languages[0] if languages else "")
 
-    def on_exit(self):
-        """Handle window close and save configuration."""
-        current_settings = {
+    def publish_settings(self, *args):
+        """Publish a new settings snapshot after any GUI change (GUI thread only)."""
+        engine = self.current_engine_var.get()
+        settings = build_settings(
+            engine,
+            self.source_lang_var.get(),
+            self.target_lang_var.get(),
+            self.engine_lang_dicts.get(engine, DEEPL_LANGUAGE_TO_CODE),
+            glossary=self.glossary,
+            deepl_key=self.deepl_key_var.get(),
+            ollama_url=self.ollama_url_var.get(),
+            ollama_model=self.ollama_model_var.get(),
+            local_model_dir=self.local_model_dir_var.get()
+        )
+        if settings is None:
+            logging.warning(f"Languages {self.source_lang_var.get()} -> {self.target_lang_var.get()} "
+                            f"are not supported by {engine}, keeping the previous settings")
+        self.settings.publish(settings)
+        self.preload_engine()
+
+    def preload_engine(self):
+        """Start loading the local translation model as soon as it is selected."""
+        settings = self.settings.current
+        if settings is not None and settings.engine == "Local":
+            preload_local_translator(settings.kwargs.get("model_dir", ""))
+
+    def collect_settings(self):
+        """Collect the current user settings from the UI."""
+        return {
             "user_settings": {
                 "engine": self.current_engine_var.get(),
                 "source_lang": self.source_lang_selector.get(),
@@ -651,10 +905,62 @@ class Mainloop:
                 ],
                 "deepl_key": self.deepl_key_var.get(),
                 "ollama_url": self.ollama_url_var.get(),
-                "ollama_model": self.ollama_model_var.get()
+                "ollama_model": self.ollama_model_var.get(),
+                "local_model_dir": self.local_model_dir_var.get(),
+                "glossary_path": self.glossary_path_var.get(),
+                "glossary_grammar": self.glossary_grammar_var.get(),
+                "record_sessions": self.record_sessions_var.get()
             }
         }
-        self.config_handler.save_config(current_settings)
+
+    def schedule_config_save(self, *args):
+        """Queue a debounced background save of the current settings."""
+        if self._applying_config:
+            return  # Values being applied were just read from disk
+        self.config_handler.schedule_save(self.collect_settings())
+
+    def apply_config(self, config):
+        """Apply a configuration reloaded from disk to the running session."""
+        self._applying_config = True
+        try:
+            self._apply_user_settings(config["user_settings"])
+        finally:
+            self._applying_config = False
+
+    def _apply_user_settings(self, settings):
+        """Push reloaded user settings into the UI variables and window state."""
+        # Geometry and device first, so nothing below can observe the stale values
+        pos = settings["monitor_position"]
+        if len(pos) == 2:
+            self.monitor_window.geometry(f"+{pos[0]}+{pos[1]}")
+
+        device_idx = settings["transcribe_device_index"]
+        if 0 <= device_idx < len(self.audio_devices) and not self.is_transcribing:
+            self.transcribe_device = self.audio_devices[device_idx]
+
+        self.source_lang = settings["source_lang"]
+        self.target_lang = settings["target_lang"]
+        self.current_engine_var.set(settings["engine"])
+        self.update_language_selectors()
+        if self.settings_window is not None and self.settings_window.winfo_exists():
+            self.update_engine_settings()
+        self.deepl_key_var.set(settings["deepl_key"])
+        self.ollama_url_var.set(settings["ollama_url"])
+        self.ollama_model_var.set(settings["ollama_model"])
+        self.local_model_dir_var.set(settings["local_model_dir"])
+        if settings["glossary_path"] != self.glossary_path_var.get():
+            self.glossary_path_var.set(settings["glossary_path"])
+            self.reload_glossary()
+        self.glossary_grammar_var.set(settings["glossary_grammar"])
+        self.record_sessions_var.set(settings["record_sessions"])
+        self.model_dir_var.set(settings["model_dir"])
+
+    def on_exit(self):
+        """Handle window close and save configuration."""
+        # Closes the session recorder, which flushes the audio still buffered
+        self.stop_transcription()
+        self.config_handler.stop_watching()
+        self.config_handler.save_config(self.collect_settings())
         self.root.destroy()
 
 def main():
@@ -0,0 +1,118 @@
+# segmenter.py
+from typing import Any, Dict, List
+
+# Target languages written without spaces between clauses
+NO_SPACE_LANG_PREFIXES = ("zh", "ja", "zho", "jpn", "yue", "th", "tha", "chinese", "japanese", "thai")
+
+
+def join_clauses(clauses: List[str], lang_code: str = "") -> str:
+    """Stitch translated clauses back into one sentence (lang_code may also be a language name)"""
+    separator = "" if (lang_code or "").lower().startswith(NO_SPACE_LANG_PREFIXES) else " "
+    return separator.join(clause.strip() for clause in clauses if clause.strip())
+
+
+class ClauseSegmenter:
+    """
+    Split long Vosk hypotheses into clause-sized units using word timings.
+    Requires the recognizer to run with SetWords(True) and SetPartialWords(True).
+    A clause is released once it ends on a pause (or reaches MAX_CLAUSE_WORDS) and
+    has been identical in two consecutive partial results.
+    """
+    PAUSE_GAP = 0.35  # Silence between words that marks a clause boundary (seconds)
+    MIN_CLAUSE_WORDS = 4  # Do not release clauses shorter than this
+    MAX_CLAUSE_WORDS = 20  # Force a split at the largest gap once a clause gets this long
+    TRAILING_WORDS = 2  # Words that must follow a boundary before it is considered stable
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Forget the current utterance"""
+        self.committed_end = 0.0  # End time of the last released word
+        self.committed_clauses = []  # Texts of the clauses released for the current utterance
+        self._previous = []  # Uncommitted words of the previous partial result
+
+    @property
+    def committed_count(self) -> int:
+        """Number of clauses released for the current utterance"""
+        return len(self.committed_clauses)
+
+    def committed_text(self) -> str:
+        """Source text of the clauses released so far"""
+        return " ".join(self.committed_clauses)
+
+    def pending_words(self, words: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Words after the last released clause.
+        Word midpoints are compared so the final result's slightly different alignment
+        cannot drop or repeat a word at a boundary with no pause.
+        """
+        if not self.committed_clauses:
+            return list(words)
+        return [w for w in words if (w.get("start", 0.0) + w.get("end", 0.0)) / 2 > self.committed_end]
+
+    def _find_boundary(self, words: List[Dict[str, Any]]) -> int:
+        """Return the number of words in the first complete clause, or 0 if none"""
+        limit = len(words) - self.TRAILING_WORDS
+        best_idx, best_gap = 0, 0.0
+        for i in range(self.MIN_CLAUSE_WORDS, min(limit, self.MAX_CLAUSE_WORDS) + 1):
+            gap = words[i]["start"] - words[i - 1]["end"]
+            if gap >= self.PAUSE_GAP:
+                return i
+            if gap > best_gap:
+                best_idx, best_gap = i, gap
+        if limit >= self.MAX_CLAUSE_WORDS:
+            return best_idx or self.MAX_CLAUSE_WORDS
+        return 0
+
+    def feed_partial(self, words: List[Dict[str, Any]]) -> List[str]:
+        """
+        Process a partial result and release clauses that have stabilized.
+        :param words: "partial_result" word list from PartialResult()
+        :return: Texts of newly released clauses, in order
+        """
+        if not words or "start" not in words[0]:
+            return []  # No word timings, nothing to segment on
+        pending = self.pending_words(words)
+        stable = []
+        for a, b in zip(pending, self._previous):
+            if a["word"] != b["word"]:
+                break
+            stable.append(a)
+
+        clauses = []
+        while True:
+            # The boundary needs TRAILING_WORDS after it, but only the clause itself must be stable
+            cut = self._find_boundary(pending)
+            if not cut or cut > len(stable):
+                break
+            clause = pending[:cut]
+            clause_text = " ".join(w["word"] for w in clause)
+            clauses.append(clause_text)
+            self.committed_clauses.append(clause_text)
+            self.committed_end = clause[-1]["end"]
+            pending = pending[cut:]
+            stable = stable[cut:]
+
+        self._previous = pending
+        return clauses
+
+    def pending_text(self, words: List[Dict[str, Any]]) -> str:
+        """Text of the words not yet released as clauses"""
+        return " ".join(w["word"] for w in self.pending_words(words))
+
+    def feed_final(self, words: List[Dict[str, Any]], text: str) -> str:
+        """
+        Close the utterance with the final result.
+        :param words: "result" word list from Result()
+        :param text: Full final text, used when word timings are unavailable
+        :return: Remaining text that still needs to be translated
+        """
+        if self.committed_count and words:
+            remainder = self.pending_text(words)
+        elif self.committed_count:
+            remainder = ""
+        else:
+            remainder = text
+        self.reset()
+        return remainder
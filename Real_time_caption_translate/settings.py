@@ -0,0 +1,69 @@
+# settings.py
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+
+from Real_time_caption_translate.glossary import Glossary
+
+
+@dataclass(frozen=True)
+class TranslationSettings:
+    """Immutable, pre-resolved translation settings shared with worker threads"""
+    engine: str
+    source_lang: str
+    target_lang: str
+    kwargs: Mapping[str, Any] = field(default_factory=lambda: MappingProxyType({}))
+    glossary: Optional[Glossary] = None
+
+
+def build_settings(engine: str, source_lang: str, target_lang: str,
+                   lang_dict: Mapping[str, str], glossary: Optional[Glossary] = None,
+                   **options) -> Optional[TranslationSettings]:
+    """
+    Resolve GUI values into a TranslationSettings snapshot.
+    :param engine: Translation engine name
+    :param source_lang: Source language name as shown in the selector
+    :param target_lang: Target language name as shown in the selector
+    :param lang_dict: Language name to code mapping of the engine
+    :param glossary: Loaded user glossary, if any
+    :param options: Engine-specific values (deepl_key, ollama_url, ollama_model, local_model_dir)
+    :return: Snapshot, or None if the languages are not supported by the engine
+    """
+    kwargs = {}
+    if engine == "Ollama":
+        kwargs["url"] = options.get("ollama_url", "")
+        kwargs["model"] = options.get("ollama_model", "")
+        kwargs["lang_target"] = target_lang
+    else:
+        if source_lang not in lang_dict or target_lang not in lang_dict:
+            return None
+        kwargs["lang_source"] = lang_dict[source_lang]
+        kwargs["lang_target"] = lang_dict[target_lang]
+        if engine == "DeepL":
+            kwargs["api_key"] = options.get("deepl_key", "")
+        elif engine == "Local":
+            kwargs["model_dir"] = options.get("local_model_dir", "")
+
+    return TranslationSettings(engine=engine,
+                               source_lang=source_lang,
+                               target_lang=target_lang,
+                               kwargs=MappingProxyType(kwargs),
+                               glossary=glossary)
+
+
+class SettingsPublisher:
+    """Single-writer holder of the current TranslationSettings snapshot"""
+
+    def __init__(self, initial: Optional[TranslationSettings] = None):
+        self._current = initial
+
+    def publish(self, settings: Optional[TranslationSettings]):
+        """Replace the current snapshot (GUI thread only). None keeps the previous one."""
+        if settings is not None:
+            # Reference assignment is atomic, so readers never see a partial update
+            self._current = settings
+
+    @property
+    def current(self) -> Optional[TranslationSettings]:
+        """Lock-free read for worker threads"""
+        return self._current
@@ -1,9 +1,231 @@
+import json
+import logging
+import os
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+
 import deep_translator
 from deep_translator.constants import DEEPL_LANGUAGE_TO_CODE, GOOGLE_LANGUAGES_TO_CODES
 from ollama import Client, ChatResponse
 
+# Optional dependencies for the offline "Local" engine
+try:
+    import ctranslate2
+    import sentencepiece
+except ImportError:
+    ctranslate2 = None
+    sentencepiece = None
+
 DEEPL_LANGUAGE_TO_CODE = DEEPL_LANGUAGE_TO_CODE
 GOOGLE_LANGUAGES_TO_CODES = GOOGLE_LANGUAGES_TO_CODES
+
+# FLORES-200 codes as used by NLLB models. M2M100 models use "__xx__" tokens instead,
+# see M2M100_LANGUAGE_CODES. Single-pair Marian models ignore the language selection.
+LOCAL_LANGUAGES_TO_CODES = {
+    "arabic": "arb_Arab",
+    "chinese (simplified)": "zho_Hans",
+    "chinese (traditional)": "zho_Hant",
+    "dutch": "nld_Latn",
+    "english": "eng_Latn",
+    "french": "fra_Latn",
+    "german": "deu_Latn",
+    "hindi": "hin_Deva",
+    "indonesian": "ind_Latn",
+    "italian": "ita_Latn",
+    "japanese": "jpn_Jpan",
+    "korean": "kor_Hang",
+    "polish": "pol_Latn",
+    "portuguese": "por_Latn",
+    "russian": "rus_Cyrl",
+    "spanish": "spa_Latn",
+    "thai": "tha_Thai",
+    "turkish": "tur_Latn",
+    "ukrainian": "ukr_Cyrl",
+    "vietnamese": "vie_Latn",
+}
+
+# FLORES-200 code to the ISO 639-1 code behind M2M100 language tokens ("__en__")
+M2M100_LANGUAGE_CODES = {
+    "arb_Arab": "ar", "zho_Hans": "zh", "zho_Hant": "zh", "nld_Latn": "nl", "eng_Latn": "en",
+    "fra_Latn": "fr", "deu_Latn": "de", "hin_Deva": "hi", "ind_Latn": "id", "ita_Latn": "it",
+    "jpn_Jpan": "ja", "kor_Hang": "ko", "pol_Latn": "pl", "por_Latn": "pt", "rus_Cyrl": "ru",
+    "spa_Latn": "es", "tha_Thai": "th", "tur_Latn": "tr", "ukr_Cyrl": "uk", "vie_Latn": "vi",
+}
+
+
+class LocalTranslator:
+    """
+    In-process CTranslate2 translator that batches pending sentences on CPU.
+    Callers submit sentences from any thread; a single worker collects everything
+    pending and translates it in one translate_batch call across intra_threads.
+    """
+    MAX_BATCH = 16  # Maximum sentences per translate_batch call
+    BATCH_WAIT = 0.01  # Time to gather more sentences before translating (seconds)
+    VOCAB_FILES = ("shared_vocabulary.json", "shared_vocabulary.txt",
+                   "target_vocabulary.json", "target_vocabulary.txt")
+    SPM_FILES = ("source.spm", "sentencepiece.bpe.model", "spm.model")
+
+    def __init__(self, model_dir: str):
+        if ctranslate2 is None or sentencepiece is None:
+            raise RuntimeError("Local engine requires the 'ctranslate2' and 'sentencepiece' packages")
+
+        model_path = Path(model_dir)
+        self.translator = ctranslate2.Translator(str(model_path),
+                                                 device="cpu",
+                                                 compute_type="int8",
+                                                 inter_threads=1,
+                                                 intra_threads=os.cpu_count() or 1)
+        self.source_spm = sentencepiece.SentencePieceProcessor(model_file=self._find_spm(model_path, self.SPM_FILES))
+        target_spm = self._find_spm(model_path, ("target.spm",) + self.SPM_FILES)
+        self.target_spm = sentencepiece.SentencePieceProcessor(model_file=target_spm)
+        self.vocabulary = self._load_vocabulary(model_path)
+
+        self._pending = []  # (text, lang_source, lang_target, future)
+        self._cond = threading.Condition()
+        self._worker = threading.Thread(target=self._batch_loop, daemon=True)
+        self._worker.start()
+
+    @staticmethod
+    def _find_spm(model_path: Path, names) -> str:
+        """Locate the first existing SentencePiece model among the given file names"""
+        for name in names:
+            if (model_path / name).exists():
+                return str(model_path / name)
+        raise FileNotFoundError(f"No SentencePiece model found in {model_path}")
+
+    def _load_vocabulary(self, model_path: Path) -> set:
+        """Load target vocabulary tokens to detect multilingual language tokens"""
+        for name in self.VOCAB_FILES:
+            vocab_file = model_path / name
+            if not vocab_file.exists():
+                continue
+            with open(vocab_file, 'r', encoding='utf-8') as f:
+                if name.endswith(".json"):
+                    return set(json.load(f))
+                return {line.rstrip("\n") for line in f}
+        return set()
+
+    def translate(self, text: str, lang_source: str = None, lang_target: str = None) -> str:
+        """Submit a sentence and block until its batch has been translated"""
+        future = Future()
+        with self._cond:
+            self._pending.append((text, lang_source, lang_target, future))
+            self._cond.notify()
+        return future.result()
+
+    def translate_batch(self, texts, lang_source: str = None, lang_target: str = None):
+        """Submit several sentences at once and return their translations in order"""
+        futures = []
+        with self._cond:
+            for text in texts:
+                future = Future()
+                self._pending.append((text, lang_source, lang_target, future))
+                futures.append(future)
+            self._cond.notify()
+        return [future.result() for future in futures]
+
+    def _batch_loop(self):
+        """Worker loop gathering pending sentences into batches"""
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                self._cond.wait(self.BATCH_WAIT)
+                batch = self._pending[:self.MAX_BATCH]
+                del self._pending[:self.MAX_BATCH]
+
+            # Group by language pair so each translate_batch call has one target prefix
+            groups = {}
+            for item in batch:
+                groups.setdefault((item[1], item[2]), []).append(item)
+            for (lang_source, lang_target), items in groups.items():
+                try:
+                    results = self._translate_group([item[0] for item in items], lang_source, lang_target)
+                    for item, result in zip(items, results):
+                        item[3].set_result(result)
+                except Exception as e:
+                    for item in items:
+                        item[3].set_exception(e)
+
+    def language_token(self, code: str):
+        """Model token for a FLORES-200 code (NLLB as-is, M2M100 as __xx__), or None for single-pair models"""
+        if not code:
+            return None
+        if code in self.vocabulary:
+            return code
+        m2m_token = f"__{M2M100_LANGUAGE_CODES.get(code, code)}__"
+        if m2m_token in self.vocabulary:
+            return m2m_token
+        return None
+
+    def _translate_group(self, texts, lang_source, lang_target):
+        """Tokenize, translate and detokenize sentences sharing a language pair"""
+        source_token = self.language_token(lang_source)
+        target_token = self.language_token(lang_target)
+        multilingual = target_token is not None
+        sources = []
+        for text in texts:
+            tokens = self.source_spm.encode(text, out_type=str) + ["</s>"]
+            if multilingual and source_token:
+                tokens = [source_token] + tokens
+            sources.append(tokens)
+
+        target_prefix = [[target_token]] * len(sources) if multilingual else None
+        results = self.translator.translate_batch(sources,
+                                                  target_prefix=target_prefix,
+                                                  beam_size=2,
+                                                  max_decoding_length=256)
+
+        translations = []
+        for result in results:
+            tokens = result.hypotheses[0]
+            if multilingual and tokens and tokens[0] == target_token:
+                tokens = tokens[1:]
+            translations.append(self.target_spm.decode(tokens))
+        return translations
+
+
+_local_translators = {}
+_local_lock = threading.Lock()
+
+
+def get_local_translator(model_dir: str) -> LocalTranslator:
+    """Load a local model once per directory and reuse it afterwards"""
+    with _local_lock:
+        translator = _local_translators.get(model_dir)
+        if translator is None:
+            translator = LocalTranslator(model_dir)
+            _local_translators[model_dir] = translator
+        return translator
+
+
+def preload_local_translator(model_dir: str):
+    """Load a local model in the background so the first caption does not wait for it"""
+    if not model_dir or not os.path.isdir(model_dir):
+        return
+    with _local_lock:
+        if model_dir in _local_translators:
+            return
+
+    def load():
+        try:
+            get_local_translator(model_dir)
+            logging.info(f"Local  translation model loaded from {model_dir}")
+        except Exception as e:
+            logging.error(f"Failed  to load local translation model {model_dir}: {e}")
+
+    threading.Thread(target=load, daemon=True).start()
+
+
+def tl_api_batch(engine: str, texts, **kwargs):
+    """Translate several sentences; the Local engine handles them in a single batch"""
+    if engine == "Local":
+        translator = get_local_translator(kwargs.get("model_dir"))
+        return translator.translate_batch(texts, kwargs.get("lang_source"), kwargs.get("lang_target"))
+    return [tl_api(engine, text, **kwargs) for text in texts]
+
+
 def tl_api(engine: str, text: str, **kwargs):
     if engine == "Google":
         lang_source = kwargs.get("lang_source")
@@ -39,6 +261,9 @@ def tl_api(engine: str, text: str, **kwargs):
         result = [response['message']['content']]
 
         translated_text = result[0]
+    elif engine == "Local":
+        translator = get_local_translator(kwargs.get("model_dir"))
+        translated_text = translator.translate(text, kwargs.get("lang_source"), kwargs.get("lang_target"))
     else:
         raise ValueError("Invalid engine")
     return translated_text
\ No newline at end of file
@@ -0,0 +1,61 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from Real_time_caption_translate.archive import SessionArchive, SessionRecorder
+
+RATE = 16000
+
+
+@pytest.fixture
+def session(tmp_path):
+    signal = (np.arange(RATE * 30) % 3000).astype('<i2')
+    recorder = SessionRecorder(tmp_path, RATE)
+    for i in range(0, len(signal), 4096):
+        recorder.write_audio(signal[i:i + 4096].tobytes())
+    recorder.add_transcript(0, "first sentence", 0.5, 9.0)
+    recorder.add_transcript(1, "second sentence", 10.0, 21.5)
+    recorder.add_translation(0, "第一句")
+    recorder.close()
+    return tmp_path, signal
+
+
+def test_sentence_lookup(session):
+    path, _ = session
+    with SessionArchive(path) as archive:
+        assert len(archive) == 2
+        assert archive.duration == 30.0
+        assert archive.sentence(0) == {"start": 0.5, "end": 9.0,
+                                       "transcript": "first sentence", "translation": "第一句"}
+        assert archive.sentence(1)["translation"] == ""
+        assert archive.find(15.0) == 1
+        assert archive.find(0.1) == 0
+
+
+def test_read_audio_across_chunks(session):
+    path, signal = session
+    with SessionArchive(path) as archive:
+        pcm = archive.read_audio(4.9, 10.2)
+        assert np.array_equal(np.frombuffer(pcm, '<i2'), signal[int(4.9 * RATE):int(10.2 * RATE)])
+        assert len(archive.sentence_audio(0)) == int(8.5 * RATE) * 2
+
+
+def test_recorder_ignores_calls_after_close(tmp_path):
+    recorder = SessionRecorder(tmp_path, RATE)
+    recorder.close()
+    recorder.write_audio(b"\x00\x00" * 10)
+    recorder.add_translation(0, "late")
+    recorder.close()
+    with SessionArchive(tmp_path) as archive:
+        assert len(archive) == 0 and archive.duration == 0.0
+
+
+def test_records_are_readable_before_close(tmp_path):
+    recorder = SessionRecorder(tmp_path, RATE)
+    recorder.write_audio(np.zeros(RATE * 6, dtype='<i2').tobytes())
+    recorder.add_transcript(0, "still recording", 0.0, 5.0)
+    recorder.add_translation(0, "仍在录音")
+    with SessionArchive(tmp_path) as archive:
+        assert archive.duration == 5.0
+        assert archive.sentence(0)["translation"] == "仍在录音"
+    recorder.close()
@@ -0,0 +1,122 @@
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from Real_time_caption_translate import config_manager
+
+
+@pytest.fixture
+def handler(tmp_path, monkeypatch):
+    monkeypatch.setattr(config_manager, "get_executable_dir", lambda: tmp_path)
+    h = config_manager.ConfigHandler()
+    h.SAVE_DELAY = 0.05
+    return h
+
+
+def settings(**overrides):
+    values = {"engine": "DeepL", "source_lang": "english", "target_lang": "german",
+              "transcribe_device_index": 0}
+    values.update(overrides)
+    return {"user_settings": values}
+
+
+def test_deep_merge_replaces_lists(handler):
+    handler.load_config()
+    for _ in range(3):
+        handler.save_config(settings(monitor_position=[10, 20]))
+        handler.load_config()
+    assert handler.config["user_settings"]["monitor_position"] == [10, 20]
+
+
+def test_deep_merge_ignores_unknown_and_mistyped(handler):
+    handler._deep_merge(handler.config, {"bogus": 1,
+                                         "user_settings": {"engine": 5, "nope": "x", "deepl_key": "k"}})
+    assert "bogus" not in handler.config
+    assert "nope" not in handler.config["user_settings"]
+    assert handler.config["user_settings"]["engine"] == "Google"
+    assert handler.config["user_settings"]["deepl_key"] == "k"
+
+
+def saved_position(handler):
+    try:
+        with open(handler.config_path, encoding="utf-8") as f:
+            return json.load(f)["user_settings"]["monitor_position"]
+    except (OSError, ValueError):
+        return None
+
+
+def wait_for_position(handler, position, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while saved_position(handler) != position and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return saved_position(handler)
+
+
+def test_debounced_save_writes_latest(handler):
+    handler.load_config()
+    for i in range(10):
+        handler.schedule_save(settings(monitor_position=[i, 0]))
+    saver = handler._saver_thread
+    assert wait_for_position(handler, [9, 0]) == [9, 0]
+    assert [p.name for p in handler.config_path.parent.iterdir()] == [handler.config_path.name]
+
+    # Later saves reuse the same saver thread
+    handler.schedule_save(settings(monitor_position=[3, 3]))
+    assert wait_for_position(handler, [3, 3]) == [3, 3]
+    assert handler._saver_thread is saver
+
+
+def test_schedule_save_does_not_wait_for_disk(handler, monkeypatch):
+    handler.load_config()
+    started = threading.Event()
+    release = threading.Event()
+    real_fsync = os.fsync
+
+    def blocked_fsync(fd):
+        started.set()
+        release.wait(5)
+        real_fsync(fd)
+
+    monkeypatch.setattr(config_manager.os, "fsync", blocked_fsync)
+    handler.schedule_save(settings(monitor_position=[1, 1]))
+    assert started.wait(5)
+
+    # The saver thread is stuck in fsync; scheduling another save must still return
+    caller = threading.Thread(target=handler.schedule_save, args=(settings(monitor_position=[2, 2]),))
+    caller.start()
+    caller.join(timeout=5)
+    assert not caller.is_alive()
+    assert not release.is_set()
+
+    release.set()
+    assert wait_for_position(handler, [2, 2]) == [2, 2]
+
+
+def test_save_config_cancels_pending_save(handler):
+    handler.load_config()
+    handler.SAVE_DELAY = 60
+    handler.schedule_save(settings(monitor_position=[4, 4]))
+    handler.save_config(settings(monitor_position=[5, 5]))
+    assert saved_position(handler) == [5, 5]
+    assert handler._save_deadline is None
+
+
+def test_watch_file_reports_modifications(handler, tmp_path):
+    glossary = tmp_path / "glossary.tsv"
+    glossary.write_text("Acme\n", encoding="utf-8")
+    changes = []
+    handler.watch_file("glossary", str(glossary), lambda: changes.append(True))
+    handler._check_watched_files()
+    assert changes == []
+
+    glossary.write_text("Acme\tAKM\n", encoding="utf-8")
+    handler._check_watched_files()
+    assert changes == [True]
+
+    handler.watch_file("glossary", "", lambda: changes.append(True))
+    glossary.write_text("Vosk\n", encoding="utf-8")
+    handler._check_watched_files()
+    assert changes == [True]
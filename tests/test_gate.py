@@ -0,0 +1,51 @@
+from Real_time_caption_translate.gate import PartialGate, parse_final, strip_unknown
+
+
+def words(text, conf=0.9):
+    return [{"word": w, "conf": conf} for w in text.split()]
+
+
+def test_translates_only_stable_prefix():
+    gate = PartialGate()
+    emitted = [gate.feed(words(text)) for text in
+               ["so", "so to", "so today", "so today we", "so today we will", "so today we will"]]
+    assert emitted == [None, None, None, "so today", "so today we", "so today we will"]
+
+
+def test_revision_resets_stability():
+    gate = PartialGate()
+    for text in ["we will go", "we will go there"]:
+        gate.feed(words(text))
+    assert gate.feed(words("he will go there")) is None
+
+
+def test_low_confidence_and_single_words_are_skipped():
+    gate = PartialGate()
+    assert [gate.feed(words("la la la la", conf=0.3)) for _ in range(4)] == [None] * 4
+    gate.reset()
+    assert [gate.feed(words("hello")) for _ in range(4)] == [None] * 4
+
+
+def test_repeated_text_is_not_emitted_twice():
+    gate = PartialGate()
+    results = [gate.feed(words("good morning everyone")) for _ in range(5)]
+    assert results.count("good morning everyone") == 1
+
+
+def test_parse_final_confidence_scale():
+    text, result_words, confidence = parse_final(
+        {"text": "hi there", "result": [{"word": "hi", "conf": 0.5}, {"word": "there", "conf": 1.0}]})
+    assert text == "hi there" and len(result_words) == 2
+    assert confidence == 0.75
+    assert parse_final({"text": ""}) == ("", [], 1.0)
+
+
+def test_unknown_tokens_are_dropped():
+    result = {"text": "[unk] acme [unk]",
+              "result": [{"word": "[unk]", "conf": 0.2}, {"word": "acme", "conf": 0.8}, {"word": "[unk]", "conf": 0.2}]}
+    text, result_words, confidence = parse_final(result)
+    assert text == "acme"
+    assert [w["word"] for w in result_words] == ["acme"]
+    assert confidence == 0.8
+    assert parse_final({"text": "[unk]", "result": [{"word": "[unk]", "conf": 1.0}]}) == ("", [], 1.0)
+    assert strip_unknown("[unk] [unk]") == ""
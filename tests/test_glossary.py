@@ -0,0 +1,51 @@
+from Real_time_caption_translate.glossary import Glossary, TermMatcher
+
+
+def test_replace_keeps_offsets_when_lowercase_changes_length():
+    matcher = TermMatcher({"acme": "ACME"})
+    assert matcher.replace("İstanbul acme test") == "İstanbul ACME test"
+
+
+def test_leftmost_longest_whole_word_matches():
+    matcher = TermMatcher({"ab": "X", "b": "Y", "abc d": "Z", "he": "H"})
+    assert matcher.replace("ab b abc d abc ushers He") == "X Y Z abc ushers H"
+
+
+def test_correct_and_protect_round_trip():
+    glossary = Glossary([("Acme Widget", "艾克米组件", ["acne widget"]), ("Vosk", "", [])])
+    assert glossary.correct("the acne widget is here") == "the Acme Widget is here"
+
+    protected, targets = glossary.protect("the Acme Widget is here")
+    assert protected == "the ZQX0Q is here"
+    assert targets == ["艾克米组件"]
+    assert Glossary.restore("这个 ZQX0Q 在这里", targets) == "这个 艾克米组件 在这里"
+    assert Glossary.restore("这个 zqx 0 q 在这里", targets) == "这个 艾克米组件 在这里"
+    assert glossary.protect("nothing to see") == ("nothing to see", [])
+
+
+def test_restore_ignores_digits_after_placeholder():
+    glossary = Glossary([("Acme", "艾克米", [])])
+    protected, targets = glossary.protect("the Acme 5 phone")
+    assert protected == "the ZQX0Q 5 phone"
+    # CJK engines often drop the space before the following number
+    assert Glossary.restore("ZQX0Q5手机", targets) == "艾克米5手机"
+
+    many = Glossary([(f"term{i}", f"T{i}", []) for i in range(12)])
+    protected, targets = many.protect(" ".join(f"term{i}" for i in range(12)))
+    assert Glossary.restore(protected.replace(" ", ""), targets) == "".join(f"T{i}" for i in range(12))
+
+
+def test_load_rejects_non_utf8_file(tmp_path):
+    path = tmp_path / "glossary.tsv"
+    path.write_bytes("产品\t产品\n".encode("gbk"))
+    assert Glossary.load(str(path)) is None
+
+
+def test_load_tab_separated_file(tmp_path):
+    path = tmp_path / "glossary.tsv"
+    path.write_text("# comment\nAcme\tAKM\tacne|akmi\nVosk\n\n", encoding="utf-8")
+    glossary = Glossary.load(str(path))
+    assert glossary.entries == [("Acme", "AKM", ["acne", "akmi"]), ("Vosk", "", [])]
+    assert glossary.phrases() == ["acme", "acne", "akmi", "vosk"]
+    assert Glossary.load("") is None
+    assert Glossary.load(str(tmp_path / "missing.tsv")) is None
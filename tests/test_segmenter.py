@@ -0,0 +1,57 @@
+from Real_time_caption_translate.segmenter import ClauseSegmenter, join_clauses
+
+
+def make_words(text, pause_before=None, shift=0.0):
+    words = []
+    t = 0.0
+    for i, word in enumerate(text.split()):
+        t += 0.5 if i == pause_before else 0.05
+        words.append({"word": word, "start": t + shift, "end": t + 0.2 + shift})
+        t += 0.2
+    return words
+
+
+SENTENCE = "so today we will talk about the budget and then we will move on to hiring plans"
+
+
+def feed_incrementally(segmenter, words):
+    released = []
+    for n in range(1, len(words) + 1):
+        released += segmenter.feed_partial(words[:n])
+    return released
+
+
+def test_releases_clause_at_pause():
+    segmenter = ClauseSegmenter()
+    released = feed_incrementally(segmenter, make_words(SENTENCE, pause_before=9))
+    assert released == ["so today we will talk about the budget and"]
+    assert segmenter.committed_text() == released[0]
+
+
+def test_final_remainder_tolerates_shifted_alignment():
+    for shift in (-0.04, 0.04):
+        segmenter = ClauseSegmenter()
+        feed_incrementally(segmenter, make_words(SENTENCE, pause_before=9))
+        remainder = segmenter.feed_final(make_words(SENTENCE, pause_before=9, shift=shift), SENTENCE)
+        assert remainder == "then we will move on to hiring plans"
+        assert segmenter.committed_count == 0
+
+
+def test_forced_split_without_pause_keeps_every_word():
+    text = " ".join(f"w{i}" for i in range(30))
+    segmenter = ClauseSegmenter()
+    released = feed_incrementally(segmenter, make_words(text))
+    final = make_words(text, shift=0.03)
+    remainder = segmenter.feed_final(final, text)
+    assert " ".join(released + [remainder]).split() == text.split()
+
+
+def test_short_utterance_is_not_split():
+    segmenter = ClauseSegmenter()
+    assert feed_incrementally(segmenter, make_words("hello there")) == []
+    assert segmenter.feed_final(make_words("hello there"), "hello there") == "hello there"
+
+
+def test_join_clauses_spacing():
+    assert join_clauses(["a b", " c "], "de") == "a b c"
+    assert join_clauses(["你好", "世界", ""], "zh-CN") == "你好世界"
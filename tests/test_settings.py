@@ -0,0 +1,41 @@
+import pytest
+
+from Real_time_caption_translate.settings import SettingsPublisher, build_settings
+
+LANGS = {"english": "en", "chinese (simplified)": "zh-CN"}
+
+
+def test_languages_resolve_to_codes():
+    settings = build_settings("Google", "english", "chinese (simplified)", LANGS)
+    assert settings.kwargs == {"lang_source": "en", "lang_target": "zh-CN"}
+    assert settings.source_lang == "english"
+    with pytest.raises(TypeError):
+        settings.kwargs["lang_target"] = "fr"
+
+
+def test_engine_options():
+    deepl = build_settings("DeepL", "english", "chinese (simplified)", LANGS, deepl_key="key")
+    assert deepl.kwargs["api_key"] == "key"
+    local = build_settings("Local", "english", "chinese (simplified)", LANGS, local_model_dir="models/nllb")
+    assert local.kwargs["model_dir"] == "models/nllb"
+    assert "api_key" not in local.kwargs
+
+
+def test_ollama_passes_language_name():
+    settings = build_settings("Ollama", "unknown", "klingon", LANGS,
+                              ollama_url="http://localhost:11434", ollama_model="qwen")
+    assert dict(settings.kwargs) == {"url": "http://localhost:11434", "model": "qwen", "lang_target": "klingon"}
+
+
+def test_unknown_language_gives_none():
+    assert build_settings("Google", "english", "klingon", LANGS) is None
+    assert build_settings("Local", "klingon", "english", LANGS) is None
+
+
+def test_publish_none_keeps_last_snapshot():
+    publisher = SettingsPublisher()
+    assert publisher.current is None
+    settings = build_settings("Google", "english", "chinese (simplified)", LANGS)
+    publisher.publish(settings)
+    publisher.publish(None)
+    assert publisher.current is settings
@@ -0,0 +1,132 @@
+import threading
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("deep_translator")
+pytest.importorskip("ollama")
+
+from Real_time_caption_translate import translator
+from Real_time_caption_translate.translator import LocalTranslator, tl_api_batch
+
+
+class FakeSentencePiece:
+    def __init__(self, model_file):
+        self.model_file = model_file
+
+    def encode(self, text, out_type=str):
+        return text.split()
+
+    def decode(self, tokens):
+        return " ".join(tokens)
+
+
+class FakeTranslator:
+    """Upper-cases tokens and records every translate_batch call"""
+
+    def __init__(self, model_path, **options):
+        self.calls = []
+
+    def translate_batch(self, sources, target_prefix=None, **options):
+        self.calls.append((sources, target_prefix))
+        results = []
+        for i, tokens in enumerate(sources):
+            if "boom" in tokens:
+                raise RuntimeError("decoding failed")
+            words = [t.upper() for t in tokens if t != "</s>" and not t.startswith("__") and "_" not in t]
+            prefix = target_prefix[i] if target_prefix else []
+            results.append(SimpleNamespace(hypotheses=[prefix + words]))
+        return results
+
+
+@pytest.fixture
+def model_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(translator, "ctranslate2", SimpleNamespace(Translator=FakeTranslator))
+    monkeypatch.setattr(translator, "sentencepiece", SimpleNamespace(SentencePieceProcessor=FakeSentencePiece))
+    monkeypatch.setattr(translator, "_local_translators", {})
+    (tmp_path / "source.spm").write_bytes(b"")
+
+    def make(vocabulary):
+        (tmp_path / "shared_vocabulary.txt").write_text("\n".join(vocabulary), encoding="utf-8")
+        return str(tmp_path)
+    return make
+
+
+def test_language_token_per_model_family(model_dir):
+    nllb = LocalTranslator(model_dir(["eng_Latn", "zho_Hans", "hello"]))
+    assert nllb.language_token("zho_Hans") == "zho_Hans"
+
+    m2m = LocalTranslator(model_dir(["__en__", "__zh__", "hello"]))
+    assert m2m.language_token("zho_Hans") == "__zh__"
+
+    marian = LocalTranslator(model_dir(["hello"]))
+    assert marian.language_token("zho_Hans") is None
+    assert marian.language_token("") is None
+
+
+def test_prefix_tokens_follow_model_family(model_dir):
+    nllb = LocalTranslator(model_dir(["eng_Latn", "zho_Hans"]))
+    assert nllb.translate("hello there", "eng_Latn", "zho_Hans") == "HELLO THERE"
+    assert nllb.translator.calls == [([["eng_Latn", "hello", "there", "</s>"]], [["zho_Hans"]])]
+
+    marian = LocalTranslator(model_dir(["hello"]))
+    assert marian.translate("hello", "eng_Latn", "zho_Hans") == "HELLO"
+    assert marian.translator.calls == [([["hello", "</s>"]], None)]
+
+
+def submit_together(local, items):
+    """Queue items before the worker wakes up, so they land in one batch"""
+    futures = []
+    with local._cond:
+        for text, lang_source, lang_target in items:
+            future = Future()
+            local._pending.append((text, lang_source, lang_target, future))
+            futures.append(future)
+        local._cond.notify()
+    return futures
+
+
+def test_batch_is_grouped_by_language_pair(model_dir):
+    local = LocalTranslator(model_dir(["eng_Latn", "zho_Hans", "fra_Latn"]))
+    futures = submit_together(local, [("one", "eng_Latn", "zho_Hans"),
+                                      ("two", "eng_Latn", "fra_Latn"),
+                                      ("three", "eng_Latn", "zho_Hans")])
+    assert [f.result(timeout=5) for f in futures] == ["ONE", "TWO", "THREE"]
+    prefixes = sorted(prefix[0][0] for _, prefix in local.translator.calls)
+    assert prefixes == ["fra_Latn", "zho_Hans"]
+    assert [len(sources) for sources, _ in local.translator.calls] == [2, 1]
+
+
+def test_group_error_reaches_every_future(model_dir):
+    local = LocalTranslator(model_dir(["eng_Latn", "zho_Hans", "fra_Latn"]))
+    futures = submit_together(local, [("boom", "eng_Latn", "zho_Hans"),
+                                      ("fine", "eng_Latn", "zho_Hans"),
+                                      ("other", "eng_Latn", "fra_Latn")])
+    for future in futures[:2]:
+        with pytest.raises(RuntimeError):
+            future.result(timeout=5)
+    assert futures[2].result(timeout=5) == "OTHER"
+
+
+def test_tl_api_batch_uses_one_local_translator(model_dir):
+    path = model_dir(["eng_Latn", "zho_Hans"])
+    kwargs = {"model_dir": path, "lang_source": "eng_Latn", "lang_target": "zho_Hans"}
+    assert tl_api_batch("Local", ["a b", "c"], **kwargs) == ["A B", "C"]
+    assert tl_api_batch("Local", ["d"], **kwargs) == ["D"]
+    assert list(translator._local_translators) == [path]
+
+
+def test_concurrent_callers_share_batches(model_dir):
+    local = LocalTranslator(model_dir(["eng_Latn", "zho_Hans"]))
+    results = {}
+
+    def call(i):
+        results[i] = local.translate(f"word{i}", "eng_Latn", "zho_Hans")
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=5)
+    assert results == {i: f"WORD{i}" for i in range(8)}